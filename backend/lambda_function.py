@@ -10,16 +10,87 @@
 # and sends it back to the frontend as JSON.
 # ─────────────────────────────────────────────────────────────────────────────
 
-import json
+import orjson
+from decimal import Decimal
 import requests
+from requests.adapters import HTTPAdapter
 import time
 import os
 import socket
+import select
+import errno
+import ipaddress
+import dns.resolver
 from urllib.parse import urlparse
+import functools
+import re
 from datetime import datetime, timedelta
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 import concurrent.futures
+import asyncio
+import aiohttp
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# SHARED HTTP SESSION — Reuse connections between checks
+# ─────────────────────────────────────────────────────────────────────────────
+# Opening a new HTTPS connection means a TCP handshake plus a TLS handshake
+# before a single byte of the page is sent. A Session keeps finished connections
+# open in a pool so the next request to the same host can skip all of that.
+#
+# It lives at module level on purpose: AWS keeps a Lambda container "warm"
+# between invocations, so the pool (and its open sockets) survives from one
+# check to the next.
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=0)
+_SESSION.mount('https://', _ADAPTER)
+_SESSION.mount('http://', _ADAPTER)
+_SESSION.headers.update({'Connection': 'keep-alive'})
+
+# Headers sent by the HTTP check. Identify ourselves politely so servers
+# don't block us as a bot.
+_HTTP_HEADERS = {
+    'User-Agent': 'Website-Status-Checker/1.0',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8'
+}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# SHARED AWS CLIENTS — Created once per container, not once per request
+# ─────────────────────────────────────────────────────────────────────────────
+# Building a boto3 client loads credentials and service definitions, which is
+# surprisingly slow. Creating them here means a warm Lambda container pays that
+# cost once, and the clients keep their own connections to AWS open for reuse.
+# Set DYNAMODB_ENDPOINT to point at a local DynamoDB (running in Docker).
+#
+# The shared Config gives both clients a bigger connection pool (so concurrent
+# region invokes don't queue for a socket), TCP keep-alive on idle connections,
+# and short timeouts with one retry so a slow AWS call can't eat the whole
+# Lambda time budget. Invoking another region waits for that region's whole
+# check to finish, so the Lambda client may read for as long as the 8 second
+# multi-region budget — and never retries, because by the time an invoke
+# times out multi_region_check has stopped waiting and a second run of the
+# remote check would be paid for but never read.
+_AWS_CONFIG = Config(
+    max_pool_connections=50,
+    retries={'total_max_attempts': 2, 'mode': 'standard'},
+    connect_timeout=1,
+    read_timeout=5,
+    tcp_keepalive=True
+)
+_DDB = boto3.resource('dynamodb', endpoint_url=os.getenv('DYNAMODB_ENDPOINT') or None, config=_AWS_CONFIG)
+_TABLE = _DDB.Table(os.environ.get('CACHE_TABLE_NAME', 'website-status-cache'))
+_LAMBDA = boto3.client('lambda', config=_AWS_CONFIG.merge(Config(read_timeout=8, retries={'total_max_attempts': 1, 'mode': 'standard'})))
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# URL PARSING — Remember recently parsed URLs
+# ─────────────────────────────────────────────────────────────────────────────
+# The same URL gets validated, then parsed again to find its host and port.
+# lru_cache remembers the last 1024 results so repeat work is a dict lookup.
+parse_url = functools.lru_cache(maxsize=1024)(urlparse)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -30,16 +101,16 @@ import concurrent.futures
 # and returns a structured result back to the browser.
 def lambda_handler(event, context):
 
-    try:
-        # Handle CORS preflight — browsers send an OPTIONS request before the
-        # real POST to confirm the server allows cross-origin requests. We just
-        # say yes and return immediately.
-        if event.get('httpMethod') == 'OPTIONS':
-            return cors_response(200, {})
+    # Handle CORS preflight — browsers send an OPTIONS request before the
+    # real POST to confirm the server allows cross-origin requests. We just
+    # say yes with a ready-made response and return immediately.
+    if event.get('httpMethod') == 'OPTIONS':
+        return _PREFLIGHT
 
+    try:
         # Pull the URL out of the request body. The frontend sends JSON like:
         # { "url": "google.com" }
-        body = json.loads(event.get('body', '{}')) if event.get('body') else {}
+        body = orjson.loads(event['body']) if event.get('body') else {}
         url = body.get('url') or event.get('url')
 
         if not url:
@@ -49,13 +120,22 @@ def lambda_handler(event, context):
         if not is_valid_url(url):
             return cors_response(400, {'error': 'Invalid URL format'})
 
-        # Run all the technical checks (DNS, HTTP, port)
-        result = check_website_status(url)
+        # Read the clock once — the response timestamp and the cache record
+        # below all use this same moment
+        now = datetime.utcnow()
 
-        # Also ask some free third-party services for their opinion on the site
-        ext = get_external_status_checks(url)
-        if ext:
-            result['external_checks'] = ext
+        # Run all the technical checks (DNS, HTTP, port)
+        result = check_website_status(url, now)
+
+        # If our own check clearly says the site is up, a second opinion adds
+        # nothing, so only ask the third-party services when something looks
+        # wrong — or when the caller asks for it with ?force_external=true.
+        # Reuse the normalised URL and domain the core check already worked out.
+        params = event.get('queryStringParameters') or {}
+        if params.get('force_external') == 'true' or not is_clearly_up(result):
+            ext = get_external_status_checks(result['url'], result['domain'], now)
+            if ext:
+                result['external_checks'] = ext
 
         return cors_response(200, result)
 
@@ -69,24 +149,29 @@ def lambda_handler(event, context):
 # ─────────────────────────────────────────────────────────────────────────────
 # This function orchestrates the three individual checks (DNS, HTTP, port),
 # times how long the whole thing takes, and bundles everything into one dict.
-def check_website_status(url):
+# `now` is the moment the invocation started; it's read here if not given.
+def check_website_status(url, now=None):
 
     # Find out which AWS region this Lambda is running in (e.g. "us-east-2")
     region = os.environ.get('AWS_REGION', 'unknown')
     start_time = time.time()
+    now = now or datetime.utcnow()
 
     # Add https:// if the user typed just "google.com" with no protocol prefix
     if not url.startswith(('http://', 'https://')):
         url = 'https://' + url
 
-    parsed = urlparse(url)
+    parsed = parse_url(url)
     host = parsed.hostname
     port = parsed.port or (443 if parsed.scheme == 'https' else 80)
 
-    # Run the three checks one by one
-    dns      = check_dns_resolution(host)       # Can the internet find this domain?
-    http     = check_http_response(url)          # Does the website respond to a request?
-    port_chk = check_port_connectivity(host, port)  # Is the server's port open?
+    # Run the three checks at the same time — they don't depend on each other,
+    # so the total wait is only as long as the slowest one (usually HTTP)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=3) as ex:
+        f_dns  = ex.submit(check_dns_resolution, host)           # Can the internet find this domain?
+        f_http = ex.submit(check_http_response, url)             # Does the website respond to a request?
+        f_port = ex.submit(check_port_connectivity, host, port)  # Is the server's port open?
+        dns, http, port_chk = f_dns.result(), f_http.result(), f_port.result()
 
     elapsed_ms = round((time.time() - start_time) * 1000, 2)
 
@@ -99,7 +184,7 @@ def check_website_status(url):
         'status': overall,
         'response_time_ms': elapsed_ms,
         'region': region,
-        'timestamp': datetime.utcnow().isoformat(),
+        'timestamp': now.isoformat(),
         'detailed_checks': {
             'dns': dns,
             'http': http,
@@ -116,19 +201,24 @@ def check_website_status(url):
 # "google.com", DNS translates it into an IP address like "142.251.33.206"
 # so your computer knows where to actually send the request.
 #
-# We ask three different DNS servers (Google, Cloudflare, OpenDNS) independently.
-# If at least one can find the domain, DNS is considered working.
+# We ask three different DNS servers (Google, Cloudflare, OpenDNS) independently
+# and at the same time. If at least one can find the domain, DNS is considered working.
 def check_dns_resolution(domain):
     dns_servers = ['8.8.8.8', '1.1.1.1', '208.67.222.222']
-    results = []
+    by_server = {}
 
-    for s in dns_servers:
-        try:
-            socket.setdefaulttimeout(3)
-            ip = socket.gethostbyname(domain)
-            results.append({'dns_server': s, 'status': 'success', 'ip_address': ip})
-        except Exception as e:
-            results.append({'dns_server': s, 'status': 'failed', 'error': str(e)})
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(dns_servers)) as ex:
+        futures = {ex.submit(cached_resolve, domain, s): s for s in dns_servers}
+
+        for f in concurrent.futures.as_completed(futures):
+            s = futures[f]
+            try:
+                by_server[s] = {'dns_server': s, 'status': 'success', 'ip_address': f.result()}
+            except Exception as e:
+                by_server[s] = {'dns_server': s, 'status': 'failed', 'error': str(e)}
+
+    # Keep the results in the same order as the server list so the UI is stable
+    results = [by_server[s] for s in dns_servers]
 
     success = sum(1 for r in results if r['status'] == 'success')
 
@@ -140,6 +230,53 @@ def check_dns_resolution(domain):
     }
 
 
+# ─── DNS helper: ask one specific DNS server ─────────────────────────────────
+# Builds a resolver that talks only to the given server (ignoring the system
+# resolver settings) and returns the first IPv4 address it answers with.
+# Each query gives up after 2 seconds so one slow server can't hold us up.
+# The timeout lives on the resolver itself — we never touch the process-wide
+# socket timeout, which would also affect the HTTP and AWS connection pools.
+#
+# If the user typed an IP address there is nothing to look up, so it is
+# returned as-is (the same as socket.gethostbyname would do).
+def resolve_with_server(domain, server):
+    try:
+        return str(ipaddress.ip_address(domain))
+    except ValueError:
+        pass
+
+    r = dns.resolver.Resolver(configure=False)
+    r.nameservers = [server]
+    r.timeout = 2.0
+    r.lifetime = 2.0
+    answer = r.resolve(domain, 'A')
+    return answer[0].to_text()
+
+
+# ─── DNS helper: remember recent answers ─────────────────────────────────────
+# DNS answers rarely change from one minute to the next, so we keep successful
+# lookups in memory for 60 seconds, keyed by (domain, server). A warm Lambda
+# container can then answer a repeat check without touching the network.
+# Only the newest DNS_CACHE_MAX entries are kept so memory stays bounded.
+DNS_CACHE_MAX = 1024
+_DNS_CACHE = {}
+
+def cached_resolve(domain, server, ttl=60):
+    key = (domain, server)
+    hit = _DNS_CACHE.get(key)
+    if hit and time.monotonic() - hit[0] < ttl:
+        return hit[1]
+
+    ip = resolve_with_server(domain, server)
+
+    # Drop the oldest entry (dicts keep insertion order) once we hit the cap
+    _DNS_CACHE.pop(key, None)
+    if len(_DNS_CACHE) >= DNS_CACHE_MAX:
+        _DNS_CACHE.pop(next(iter(_DNS_CACHE)), None)
+    _DNS_CACHE[key] = (time.monotonic(), ip)
+    return ip
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # CHECK 2 — HTTP Response
 # ─────────────────────────────────────────────────────────────────────────────
@@ -147,23 +284,29 @@ def check_dns_resolution(domain):
 # an HTTP request and waits for a response. A status code of 200 means the
 # page loaded successfully. We also follow any redirects (e.g. http → https)
 # and record how long the whole thing took.
+#
+# We only need the status code and size, not the page itself, so we start with
+# a HEAD request (headers only). Some servers refuse HEAD, in which case we fall
+# back to a GET — but streamed, so the body isn't downloaded unless needed.
 def check_http_response(url):
-    # Identify ourselves politely so servers don't block us as a bot
-    headers = {
-        'User-Agent': 'Website-Status-Checker/1.0',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8'
-    }
-
     try:
         start = time.time()
-        resp = requests.get(url, headers=headers, timeout=10, allow_redirects=True, verify=True)
+        resp = _SESSION.head(url, headers=_HTTP_HEADERS, timeout=10, allow_redirects=True, verify=True)
+
+        if resp.status_code in (403, 405, 501):
+            resp = _SESSION.get(url, headers=_HTTP_HEADERS, timeout=10, allow_redirects=True, verify=True, stream=True)
         rt = round((time.time() - start) * 1000, 2)
 
+        try:
+            content_length = get_content_length(resp)
+        finally:
+            resp.close()  # Hand the connection back to the pool
+
         return {
             'status': 'success',
             'status_code': resp.status_code,
             'response_time_ms': rt,
-            'content_length': len(resp.content) if resp.content else 0,
+            'content_length': content_length,
             'redirected': resp.url != url,
             'final_url': resp.url if resp.url != url else None
         }
@@ -176,6 +319,28 @@ def check_http_response(url):
         return {'status': 'error', 'error': str(e)}
 
 
+# ─── HTTP helper: work out the page size without downloading it ──────────────
+# Most servers tell us the size up front in the Content-Length header. If they
+# don't (and this was a GET), read at most MAX_READ bytes of the body — enough
+# to size typical pages while keeping memory use small on huge ones.
+MAX_READ = 65536
+
+def get_content_length(resp):
+    header = resp.headers.get('Content-Length', '')
+    if header.isdigit():
+        return int(header)
+    if resp.request.method == 'GET':
+        # iter_content (rather than resp.raw) so a body that breaks mid-read
+        # raises a requests error, which check_http_response reports as 'error'
+        size = 0
+        for chunk in resp.iter_content(8192):
+            size += len(chunk)
+            if size >= MAX_READ:
+                break
+        return min(size, MAX_READ)
+    return 0
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # CHECK 3 — Port Connectivity
 # ─────────────────────────────────────────────────────────────────────────────
@@ -183,19 +348,34 @@ def check_http_response(url):
 # (HTTPS) or port 80 (HTTP). Even if DNS works and the server exists, the port
 # could be blocked by a firewall. This check opens a direct TCP connection to
 # confirm the door is actually open and accepting visitors.
-def check_port_connectivity(domain, port):
+#
+# The socket is non-blocking: we start the connection, then let select() wait
+# for it. That returns the moment the server answers, and gives up exactly
+# when the timeout runs out on firewalled ports that never answer.
+def check_port_connectivity(domain, port, timeout=5):
+    sock = None
     try:
         sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(5)
+        sock.setblocking(False)
         start = time.time()
-        ok = sock.connect_ex((domain, port)) == 0  # connect_ex returns 0 on success
+        err = sock.connect_ex((domain, port))
+
+        if err in (0, errno.EINPROGRESS, errno.EWOULDBLOCK):
+            # Writable means the handshake finished; SO_ERROR says whether it worked
+            _, writable, failed = select.select([], [sock], [sock], timeout)
+            ok = bool(writable) and not failed and sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0
+        else:
+            ok = False  # Refused straight away (e.g. nothing listening on the port)
         rt = round((time.time() - start) * 1000, 2)
-        sock.close()
         return {'port': port, 'status': 'open' if ok else 'closed', 'response_time_ms': rt}
 
     except Exception as e:
         return {'port': port, 'status': 'error', 'error': str(e)}
 
+    finally:
+        if sock:
+            sock.close()
+
 
 # ─────────────────────────────────────────────────────────────────────────────
 # EXTERNAL CHECKS — Ask third-party services for a second opinion
@@ -204,39 +384,22 @@ def check_port_connectivity(domain, port):
 # they think the site is up. This gives a broader picture — if our check says
 # "up" but others say "down", the site might be up only in some regions.
 #
-# We run all three requests in parallel (simultaneously) to save time, and we
-# cache the result in DynamoDB for 5 minutes so we don't hammer those services
-# if the same URL is checked multiple times in quick succession.
-def get_external_status_checks(url):
+# We run all three requests at the same time on a single asyncio event loop to
+# save time, and we cache the result for 5 minutes so we don't hammer those
+# services if the same URL is checked multiple times in quick succession.
+def get_external_status_checks(url, domain, now=None):
+    now = now or datetime.utcnow()
     try:
         # Check if we already have a fresh cached result for this URL
-        cached = get_cached_external_result(url)
+        cached = get_cached_external_result(url, now)
         if cached:
             return cached
 
-        checks = {}
-
-        # Run all three external checks at the same time using a thread pool
-        with concurrent.futures.ThreadPoolExecutor(max_workers=3) as ex:
-            futures = {
-                ex.submit(check_downforeveryoneorjustme, url): 'downforeveryoneorjustme',
-                ex.submit(check_isitdownrightnow, url):        'isitdownrightnow',
-                ex.submit(check_websiteplanet, url):           'websiteplanet'
-            }
-
-            # Collect results as each thread finishes (whichever finishes first)
-            for f in concurrent.futures.as_completed(futures, timeout=5):
-                svc = futures[f]
-                try:
-                    r = f.result(timeout=3)
-                    if r:
-                        checks[svc] = r
-                except Exception as e:
-                    checks[svc] = {'status': 'error', 'error': str(e)}
+        checks = run_async(gather_external_checks(url, domain))
 
         # Save the combined result to DynamoDB so the next check can use it
         if checks:
-            cache_external_result(url, checks)
+            cache_external_result(url, checks, now)
 
         return checks
 
@@ -245,54 +408,126 @@ def get_external_status_checks(url):
         return None
 
 
+# ─── Async plumbing: one event loop and one HTTP session per container ──────
+# asyncio lets a single thread wait on many network requests at once, so we
+# don't need to start a thread for each external service. The loop and the
+# aiohttp session are kept at module level (not recreated with asyncio.run on
+# every call) so that, like _SESSION, a warm Lambda container keeps its open
+# connections and its 5-minute DNS cache between invocations.
+_AIO_LOOP = None
+_AIO_SESSION = None
+
+def run_async(coro):
+    global _AIO_LOOP
+    if _AIO_LOOP is None or _AIO_LOOP.is_closed():
+        _AIO_LOOP = asyncio.new_event_loop()
+    return _AIO_LOOP.run_until_complete(coro)
+
+
+def get_aio_session():
+    # Must be called from inside the event loop — the session belongs to it
+    global _AIO_SESSION
+    if _AIO_SESSION is None or _AIO_SESSION.closed:
+        _AIO_SESSION = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=8, ttl_dns_cache=300, keepalive_timeout=60),
+            timeout=aiohttp.ClientTimeout(total=3)
+        )
+    return _AIO_SESSION
+
+
+# ─── Run the three external services together ────────────────────────────────
+# The whole external phase gets one hard 4 second deadline — Lambda bills by
+# the millisecond, so a slow third party must never hold up the response.
+# Services still running at the deadline are cancelled and reported as a
+# timeout. A service that crashes is reported as an error; one that returns
+# nothing (couldn't decide) is simply left out of the result.
+EXTERNAL_DEADLINE_SECONDS = 4.0
+
+async def gather_external_checks(url, domain):
+    services = {
+        'downforeveryoneorjustme': check_downforeveryoneorjustme,
+        'isitdownrightnow':        check_isitdownrightnow,
+        'websiteplanet':           check_websiteplanet
+    }
+    tasks = {svc: asyncio.ensure_future(fn(url, domain)) for svc, fn in services.items()}
+    _, pending = await asyncio.wait(tasks.values(), timeout=EXTERNAL_DEADLINE_SECONDS)
+    for t in pending:
+        t.cancel()
+
+    checks = {}
+    for svc, t in tasks.items():
+        if t in pending:
+            checks[svc] = {'status': 'timeout'}
+        elif t.exception():
+            checks[svc] = {'status': 'error', 'error': str(t.exception())}
+        elif t.result():
+            checks[svc] = t.result()
+    return checks
+
+
 # ─── External service: downforeveryoneorjustme.com ───────────────────────────
 # A well-known site that tells you if a domain is down for everyone globally
 # or just a problem on your local network.
-def check_downforeveryoneorjustme(url):
-    domain = urlparse(url).netloc
+async def check_downforeveryoneorjustme(url, domain):
     try:
-        r = requests.get(f"https://downforeveryoneorjustme.com/check?domain={domain}", timeout=3)
-        txt = r.text.lower()
+        async with get_aio_session().get(f"https://downforeveryoneorjustme.com/check?domain={domain}") as r:
+            txt = (await r.text()).lower()
         if 'just you' in txt:
             return {'status': 'up', 'message': 'Site appears up'}
         if 'not just you' in txt:
             return {'status': 'down', 'message': 'Site appears down'}
         return {'status': 'unknown', 'message': 'Could not determine'}
-    except:
+    except Exception:
         return None
 
 
 # ─── External service: isitdownrightnow (direct probe) ───────────────────────
 # We probe the domain directly with a HEAD request — a lightweight request that
 # only fetches headers, not the full page. Fast and efficient for status checks.
-def check_isitdownrightnow(url):
-    domain = urlparse(url).netloc
+async def check_isitdownrightnow(url, domain):
     try:
-        r = requests.head(f"http://{domain}", timeout=3, allow_redirects=True)
-        return {'status': 'up' if r.status_code < 400 else 'down', 'status_code': r.status_code}
-    except:
+        async with get_aio_session().head(f"http://{domain}", allow_redirects=True) as r:
+            return {'status': 'up' if r.status < 400 else 'down', 'status_code': r.status}
+    except Exception:
         return {'status': 'down', 'error': 'Connection failed'}
 
 
 # ─── External service: websiteplanet (dual-protocol probe) ───────────────────
-# Tries to reach the site over both HTTPS and HTTP. If either protocol works,
-# the site is considered up. Useful for catching servers that have SSL issues.
-def check_websiteplanet(url):
-    domain = urlparse(url).netloc
+# Tries to reach the site over both HTTPS and HTTP at the same time. As soon as
+# either protocol works, the site is considered up and we stop waiting for the
+# other one. Useful for catching servers that have SSL issues.
+async def check_websiteplanet(url, domain):
     protocols = ['https', 'http']
     results = []
 
-    for p in protocols:
-        try:
-            r = requests.get(f"{p}://{domain}", timeout=3, allow_redirects=True)
-            results.append({'protocol': p, 'status': 'up' if r.status_code < 400 else 'down', 'status_code': r.status_code})
-        except:
-            results.append({'protocol': p, 'status': 'down', 'error': 'Connection failed'})
+    tasks = [asyncio.ensure_future(probe_protocol(p, domain)) for p in protocols]
+    try:
+        for next_done in asyncio.as_completed(tasks, timeout=3.5):
+            try:
+                results.append(await next_done)
+            except asyncio.TimeoutError:
+                break
+            if results[-1]['status'] == 'up':
+                break
+    finally:
+        # Don't wait around for the slower protocol once we have an answer
+        for t in tasks:
+            t.cancel()
 
     up = [r for r in results if r['status'] == 'up']
     return {'status': 'up', 'protocols': results} if up else {'status': 'down', 'protocols': results}
 
 
+# ─── websiteplanet helper: probe one protocol ────────────────────────────────
+# Only the status line and headers are needed, so the body is never read.
+async def probe_protocol(p, domain):
+    try:
+        async with get_aio_session().get(f"{p}://{domain}", allow_redirects=True) as r:
+            return {'protocol': p, 'status': 'up' if r.status < 400 else 'down', 'status_code': r.status}
+    except Exception:
+        return {'protocol': p, 'status': 'down', 'error': 'Connection failed'}
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # OVERALL STATUS — Combine the three check results into one verdict
 # ─────────────────────────────────────────────────────────────────────────────
@@ -315,6 +550,17 @@ def determine_overall_status(checks):
     return 'down'
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# CLEARLY UP — Is our own check confident enough on its own?
+# ─────────────────────────────────────────────────────────────────────────────
+# "up" only means the HTTP request got an answer — that answer could still be
+# an error page like 503. We only call it clearly up when the status code is
+# below 400 (a normal page or a redirect).
+def is_clearly_up(result):
+    http = result['detailed_checks']['http']
+    return result['status'] == 'up' and http.get('status_code', 500) < 400
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # STATUS SUMMARY — One-line plain-English summary of all three checks
 # ─────────────────────────────────────────────────────────────────────────────
@@ -330,28 +576,44 @@ def generate_status_summary(checks):
 
 
 # ─────────────────────────────────────────────────────────────────────────────
-# CACHE READ — Get a previously stored result from DynamoDB
+# CACHE READ — Get a previously stored result (memory first, then DynamoDB)
 # ─────────────────────────────────────────────────────────────────────────────
-# Before running external checks, we look in DynamoDB to see if we already
-# checked this URL in the last 5 minutes. If yes, return the saved result
-# immediately — faster for the user and avoids overloading third-party services.
-def get_cached_external_result(url):
+# Before running external checks, we look for a result from the last 5 minutes.
+# There are two places to look:
+#   1. _EXT_CACHE — a plain dict inside this Lambda container. Free to read,
+#      but only survives while the container stays warm.
+#   2. DynamoDB   — shared by every container, but costs a network round trip.
+# If either has a fresh result, return it immediately — faster for the user
+# and avoids overloading third-party services.
+#
+# Like the DNS cache, only the newest EXT_CACHE_MAX URLs are kept in memory,
+# and a stale entry is thrown away as soon as it's read.
+EXT_CACHE_SECONDS = 300
+EXT_CACHE_MAX = 1024
+_EXT_CACHE = {}
+
+def get_cached_external_result(url, now=None):
+    hit = _EXT_CACHE.get(url)
+    if hit:
+        if time.time() - hit[0] < EXT_CACHE_SECONDS:
+            return hit[1]
+        _EXT_CACHE.pop(url, None)
+
     try:
-        params = {}
-        endpoint = os.getenv('DYNAMODB_ENDPOINT')
-        if endpoint:
-            # Use a local DynamoDB (running in Docker) if the endpoint is set
-            params['endpoint_url'] = endpoint
-
-        dynamodb = boto3.resource('dynamodb', **params)
-        table = dynamodb.Table(os.environ.get('CACHE_TABLE_NAME', 'website-status-cache'))
-        resp = table.get_item(Key={'url': url, 'type': 'external'})
+        resp = _TABLE.get_item(Key={'url': url, 'type': 'external'})
         item = resp.get('Item')
 
         if item:
-            cache_time = datetime.fromisoformat(item['timestamp'])
+            # DynamoDB's TTL cleanup can lag behind by hours, so an expired
+            # record may still come back — check the expiry ourselves
+            if 'ttl' in item and int(item['ttl']) <= time.time():
+                return None
+
+            age = (now or datetime.utcnow()) - datetime.fromisoformat(item['timestamp'])
             # Only use the cached result if it's less than 5 minutes old
-            if datetime.utcnow() - cache_time < timedelta(minutes=5):
+            if age < timedelta(seconds=EXT_CACHE_SECONDS):
+                # Remember it in memory, aged to match the DynamoDB record
+                remember_external_result(url, time.time() - age.total_seconds(), item['data'])
                 return item['data']
 
         return None
@@ -363,28 +625,27 @@ def get_cached_external_result(url):
         return None
 
 
+# ─── Cache helper: store a result in memory ──────────────────────────────────
+# Drops the oldest entry (dicts keep insertion order) once we hit the cap.
+def remember_external_result(url, ts, data):
+    _EXT_CACHE.pop(url, None)
+    if len(_EXT_CACHE) >= EXT_CACHE_MAX:
+        _EXT_CACHE.pop(next(iter(_EXT_CACHE)), None)
+    _EXT_CACHE[url] = (ts, data)
+
+
 # ─────────────────────────────────────────────────────────────────────────────
-# CACHE WRITE — Save external check results to DynamoDB
+# CACHE WRITE — Save external check results to memory and DynamoDB
 # ─────────────────────────────────────────────────────────────────────────────
 # After running external checks, we save the results so the next request for
 # the same URL within 5 minutes can skip the slow external calls.
+# The in-memory copy is written first so it's available even if DynamoDB fails.
 # The TTL field tells DynamoDB to automatically delete the record after 10 minutes.
-def cache_external_result(url, data):
+def cache_external_result(url, data, now=None):
+    remember_external_result(url, time.time(), data)
+
     try:
-        params = {}
-        endpoint = os.getenv('DYNAMODB_ENDPOINT')
-        if endpoint:
-            params['endpoint_url'] = endpoint
-
-        dynamodb = boto3.resource('dynamodb', **params)
-        table = dynamodb.Table(os.environ.get('CACHE_TABLE_NAME', 'website-status-cache'))
-        table.put_item(Item={
-            'url': url,
-            'type': 'external',
-            'data': data,
-            'timestamp': datetime.utcnow().isoformat(),
-            'ttl': int((datetime.utcnow() + timedelta(minutes=10)).timestamp())
-        })
+        _TABLE.put_item(Item=build_cache_item(url, data, now or datetime.utcnow()))
 
     except ClientError as e:
         print(f"DynamoDB ClientError: {e.response['Error']['Message']}")
@@ -392,17 +653,41 @@ def cache_external_result(url, data):
         print(f"Cache error: {e}")
 
 
+# ─── Cache helper: build one DynamoDB record ─────────────────────────────────
+# The timestamp and TTL are both worked out from the same `now`, so the clock
+# is only read once per write.
+def build_cache_item(url, data, now):
+    return {
+        'url': url,
+        'type': 'external',
+        'data': data,
+        'timestamp': now.isoformat(),
+        'ttl': int((now + timedelta(minutes=10)).timestamp())
+    }
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # URL VALIDATOR
 # ─────────────────────────────────────────────────────────────────────────────
 # Before running any checks, we make sure the input looks like a real web URL.
 # We accept both "google.com" (no protocol) and "https://google.com" (with protocol).
 # Returns True if valid, False if not.
+#
+# Almost every input is a plain "example.com/path" style address, which the
+# pre-compiled regex recognises without any parsing. Anything it doesn't
+# recognise (IPv6 addresses, query strings without a path, "localhost", ...)
+# falls through to the full urlparse check below.
+_URL_RE = re.compile(r'^(?:https?://)?([A-Za-z0-9\-._~]+)(?::\d+)?(?:/.*)?$')
+
 def is_valid_url(url):
     try:
+        m = _URL_RE.match(url)
+        if m and '.' in m.group(1):
+            return True
+
         if not url.startswith(('http://', 'https://')):
             url = 'https://' + url
-        p = urlparse(url)
+        p = parse_url(url)
         return p.scheme in ('http', 'https') and p.netloc != ''
     except:
         return False
@@ -415,20 +700,37 @@ def is_valid_url(url):
 # the browser blocks the response because the frontend (port 5173) and the
 # backend API are on different origins. The headers tell the browser "yes,
 # this response is safe to share with the frontend."
+#
+# orjson turns the body into JSON much faster than the standard json module.
+# It doesn't know about Decimal (the type DynamoDB uses for every number in a
+# cached result), so json_default converts those back to plain ints/floats.
+def json_default(obj):
+    if isinstance(obj, Decimal):
+        return int(obj) if obj == obj.to_integral_value() else float(obj)
+    raise TypeError(f"Type {type(obj).__name__} is not JSON serializable")
+
+
+# The headers never change, so they're built once and shared by every response.
+_CORS_HEADERS = {
+    'Content-Type': 'application/json',
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Methods': 'GET,POST,OPTIONS',
+    'Access-Control-Allow-Headers': 'Content-Type,Authorization',
+    'Access-Control-Max-Age': '86400'
+}
+
 def cors_response(status_code, body):
     return {
         'statusCode': status_code,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*',
-            'Access-Control-Allow-Methods': 'GET,POST,OPTIONS',
-            'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-            'Access-Control-Max-Age': '86400'
-        },
-        'body': json.dumps(body)
+        'headers': _CORS_HEADERS,
+        'body': orjson.dumps(body, default=json_default).decode()
     }
 
 
+# The answer to a CORS preflight is always the same, so it's built once here
+_PREFLIGHT = {'statusCode': 200, 'headers': _CORS_HEADERS, 'body': '{}'}
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # ENTRY POINT — Multi-Region Check
 # ─────────────────────────────────────────────────────────────────────────────
@@ -440,38 +742,47 @@ def cors_response(status_code, body):
 # The overall status will be "up" (all regions), "mixed", or "down" (no regions).
 def multi_region_check(event, context):
     try:
-        body = json.loads(event.get('body', '{}')) if event.get('body') else {}
+        body = orjson.loads(event['body']) if event.get('body') else {}
         url = body.get('url')
 
         if not url:
             return cors_response(400, {'error': 'URL is required'})
 
-        # Run our own local check first
-        local = check_website_status(url)
+        # Read the clock once for both the local result and the overall response
+        now = datetime.utcnow()
 
         # Get the list of other regions to check (set in the Lambda environment variables)
-        other_regions = os.environ.get('OTHER_REGIONS', '').split(',')
-        other_results = []
-
-        if other_regions and other_regions[0]:
-            client = boto3.client('lambda')
-
-            for r in other_regions:
-                if r.strip():
-                    try:
-                        # Invoke the single-region Lambda deployed in the other region
-                        # by calling it by name. Each region has its own copy of the function.
-                        fname = f"website-status-checker-{r.strip()}"
-                        resp = client.invoke(
-                            FunctionName=fname,
-                            InvocationType='RequestResponse',
-                            Payload=json.dumps({'url': url})
-                        )
-                        pl = json.loads(resp['Payload'].read())
-                        if pl.get('statusCode') == 200:
-                            other_results.append(json.loads(pl['body']))
-                    except Exception as e:
-                        print(f"Invoke {r} error: {e}")
+        other_regions = [r.strip() for r in os.environ.get('OTHER_REGIONS', '').split(',') if r.strip()]
+        by_region = {}
+
+        # Invoke every other region at the same time, so the total wait is the
+        # slowest region rather than all of them added together. No thread
+        # pool is needed when there are no other regions configured.
+        ex = concurrent.futures.ThreadPoolExecutor(max_workers=len(other_regions)) if other_regions else None
+        payload = orjson.dumps({'url': url})
+        futures = {ex.submit(invoke_region_check, r, payload): r for r in other_regions} if ex else {}
+        deadline = time.time() + 8  # Remote regions get at most 8 seconds in total
+
+        # Run our own local check while the other regions are working
+        local = check_website_status(url, now)
+
+        try:
+            for f in concurrent.futures.as_completed(futures, timeout=max(0, deadline - time.time())):
+                r = futures[f]
+                try:
+                    res = f.result()
+                    if res:
+                        by_region[r] = res
+                except Exception as e:
+                    print(f"Invoke {r} error: {e}")
+        except concurrent.futures.TimeoutError:
+            print("Multi-region invoke timed out waiting for some regions")
+        finally:
+            if ex:
+                ex.shutdown(wait=False)
+
+        # Keep remote results in the same order as OTHER_REGIONS
+        other_results = [by_region[r] for r in other_regions if r in by_region]
 
         # Combine local result with all remote results
         all_res = [local] + other_results
@@ -491,7 +802,7 @@ def multi_region_check(event, context):
             'regions_up': up,
             'total_regions': total,
             'results': all_res,
-            'timestamp': datetime.utcnow().isoformat(),
+            'timestamp': now.isoformat(),
             'analysis': analyze_multi_region_results(all_res)
         })
 
@@ -500,6 +811,22 @@ def multi_region_check(event, context):
         return cors_response(500, {'error': 'Internal server error'})
 
 
+# ─── Multi-region helper: run the check in one other region ─────────────────
+# Invokes the single-region Lambda deployed in the other region by calling it
+# by name — each region has its own copy of the function. Returns that region's
+# result dict, or None if it didn't answer with a 200.
+def invoke_region_check(region, payload):
+    resp = _LAMBDA.invoke(
+        FunctionName=f"website-status-checker-{region}",
+        InvocationType='RequestResponse',
+        Payload=payload
+    )
+    pl = orjson.loads(resp['Payload'].read())
+    if pl.get('statusCode') == 200:
+        return orjson.loads(pl['body'])
+    return None
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # MULTI-REGION ANALYSIS — Summarize results across all regions in plain English
 # ─────────────────────────────────────────────────────────────────────────────
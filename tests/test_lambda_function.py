@@ -0,0 +1,56 @@
+# ─────────────────────────────────────────────────────────────────────────────
+# test_lambda_function.py — Tests for the backend Lambda checks.
+#
+# Each test starts a tiny HTTP server on localhost, so no internet access or
+# AWS account is needed. Run from the repo root with:  python -m pytest -q
+# ─────────────────────────────────────────────────────────────────────────────
+
+import os
+import sys
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+# boto3 clients are created at import time and need a region to exist
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-2')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import lambda_function  # noqa: E402
+
+
+# ─── Test server: refuses HEAD, then breaks the GET body halfway through ────
+# Sends a valid first chunk followed by a garbage chunk size, then hangs up —
+# the same thing a crashing server or a dropped connection looks like.
+class BrokenBodyHandler(BaseHTTPRequestHandler):
+    def do_HEAD(self):
+        self.send_response(405)
+        self.end_headers()
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        self.wfile.write(b'5\r\nhello\r\nzz\r\nbroken')
+        self.wfile.flush()
+        self.connection.shutdown(socket.SHUT_RDWR)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def broken_body_url():
+    server = HTTPServer(('127.0.0.1', 0), BrokenBodyHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/"
+    server.shutdown()
+    server.server_close()
+
+
+def test_http_check_reports_body_broken_mid_read_as_error(broken_body_url):
+    result = lambda_function.check_http_response(broken_body_url)
+
+    assert result['status'] == 'error'
+    assert 'error' in result